@@ -1,10 +1,397 @@
 from azure.core.credentials import AzureKeyCredential
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import RequestsTransport
 from azure.search.documents import SearchClient
+from azure.search.documents.indexes import SearchIndexClient
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
 import json
 import os
 import argparse
 import sys
+import threading
 from tqdm import tqdm
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+# Max page size
+PAGE_SIZE = 1000
+# Max skip the service allows, which also bounds paging by continuation token
+MAX_SKIP = 100000
+# Output file buffer size
+WRITE_BUFFER_SIZE = 64 * 1024
+# zstd compression level for .zst output, a good balance of speed and ratio
+ZSTD_LEVEL = 3
+# Number of connections kept open to the service
+CONNECTION_POOL_SIZE = 32
+# Characters allowed in document keys, in ordinal order
+KEY_CHARS = sorted("-0123456789=ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz")
+
+def _create_transport(pool_size=CONNECTION_POOL_SIZE):
+    """
+    Create an HTTP transport that keeps a pool of connections to the service open,
+    so requests reuse TLS sessions instead of reconnecting.
+    """
+    session = requests.Session()
+    # Retries are left to the SDK's retry policy, as with the default transport
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False)
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return RequestsTransport(session=session, connection_timeout=30)
+
+def _open_output(output_file):
+    """
+    Open output_file for binary writing, compressing with zstd when its name ends in .zst.
+    """
+    if not output_file.endswith('.zst'):
+        return open(output_file, 'wb', buffering=WRITE_BUFFER_SIZE)
+    if zstd is None:
+        raise ImportError("the zstandard package is required to write .zst files")
+    compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+    return compressor.stream_writer(open(output_file, 'wb'))
+
+def _dumps(doc):
+    """
+    Serialize a document to compact UTF-8 encoded JSON, using orjson when it is installed.
+    """
+    if orjson:
+        return orjson.dumps(doc, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(doc, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _get_index_fields(endpoint, credential, index_name):
+    """
+    Fetch the fields of the index definition. The service only lets admin keys
+    read it, so None is returned when the key is refused.
+    """
+    try:
+        with SearchIndexClient(endpoint=endpoint, credential=credential, transport=_create_transport(1)) as index_client:
+            return index_client.get_index(index_name).fields
+    except HttpResponseError as e:
+        if e.status_code != 403:
+            raise
+        return None
+
+def _find_key_field(fields):
+    """
+    Find the index's key field. Documents can only be paged by it if it is
+    sortable and filterable.
+    
+    Returns the field name and None, or None and the reason it can't be used.
+    """
+    key = next(field for field in fields if field.key)
+    if not (key.sortable and key.filterable):
+        return None, f"the key field '{key.name}' must be sortable and filterable to page by"
+    return key.name, None
+
+def _default_select_fields(fields, include_vectors=False):
+    """
+    List the index's retrievable fields, leaving out vector fields unless include_vectors is set.
+    """
+    return [
+        field.name for field in fields
+        if not field.hidden and (include_vectors or not field.vector_search_dimensions)
+    ]
+
+def _iter_pages(client, search_options, key_field=None, top=None, start_key=None):
+    """
+    Yield pages of documents matching the search options.
+    
+    Without a key field the SDK follows the service's continuation tokens via
+    by_page(). The service caps those at 100,000 documents (one more is requested,
+    so callers can tell a truncated export apart), so when a key field is given
+    the index is walked with keyset pagination instead: results are
+    ordered by the key and each request only asks for keys after the last one seen,
+    starting after start_key if given.
+    """
+    if not key_field:
+        # Without top the service returns a single page of 50 results, so ask for
+        # as many as the continuation tokens can reach, plus one past the limit
+        if not top or top > MAX_SKIP:
+            top = MAX_SKIP + 1
+        search_options = dict(search_options, top=top)
+        yield from client.search("*", **search_options).by_page()
+        return
+    
+    search_options = dict(search_options, order_by=[f"{key_field} asc"])
+    select_fields = search_options.get("select")
+    if select_fields and key_field not in select_fields:
+        search_options["select"] = list(select_fields) + [key_field]
+    filter_expression = search_options.get("filter")
+    
+    last_key = start_key
+    remaining = top
+    while remaining is None or remaining > 0:
+        page_size = PAGE_SIZE if remaining is None else min(PAGE_SIZE, remaining)
+        
+        filters = []
+        if filter_expression:
+            filters.append(f"({filter_expression})")
+        if last_key is not None:
+            escaped_key = str(last_key).replace("'", "''")
+            filters.append(f"{key_field} gt '{escaped_key}'")
+        if filters:
+            search_options["filter"] = " and ".join(filters)
+        
+        page = list(client.search("*", top=page_size, **search_options))
+        if not page:
+            break
+        # Read the key before yielding, since the caller may drop it from the documents
+        last_key = page[-1][key_field]
+        yield page
+        
+        # If we got fewer docs than requested (end of results)
+        if len(page) < page_size:
+            break
+        if remaining is not None:
+            remaining -= len(page)
+
+def _key_range_filters(key_field, shard_count):
+    """
+    Split the key space into contiguous ranges by leading character and return an
+    OData filter for each. The first and last ranges are open-ended, so every key
+    falls into exactly one range.
+    """
+    shard_count = min(shard_count, len(KEY_CHARS))
+    bounds = [KEY_CHARS[len(KEY_CHARS) * i // shard_count] for i in range(1, shard_count)]
+    filters = []
+    for i in range(shard_count):
+        conditions = []
+        if i > 0:
+            conditions.append(f"{key_field} ge '{bounds[i - 1]}'")
+        if i < shard_count - 1:
+            conditions.append(f"{key_field} lt '{bounds[i]}'")
+        filters.append(" and ".join(conditions))
+    return filters
+
+class _DocumentWriter:
+    """
+    Writes encoded documents to a binary file, either as a JSON array or as
+    NDJSON (one document per line). Pass the number of documents already in the
+    file to carry on writing after them.
+    """
+    
+    def __init__(self, f, output_format='json', count=0):
+        self.f = f
+        self.output_format = output_format
+        self.count = count
+        # A count means we're appending to documents already written
+        if output_format == 'json' and not count:
+            f.write(b'[')
+    
+    def write(self, doc_bytes):
+        if self.output_format == 'ndjson':
+            self.f.write(doc_bytes)
+            self.f.write(b'\n')
+        else:
+            if self.count:
+                self.f.write(b',')
+            self.f.write(doc_bytes)
+        self.count += 1
+    
+    def close(self):
+        if self.output_format == 'json':
+            self.f.write(b']')
+
+def _shard_path(output_file, number):
+    """
+    Name shard number of output_file, e.g. output.part001.ndjson for output.ndjson.
+    """
+    compression = '.zst' if output_file.endswith('.zst') else ''
+    base, extension = os.path.splitext(output_file[:len(output_file) - len(compression)])
+    return f"{base}.part{number:03d}{extension}{compression}"
+
+def _manifest_path(output_file):
+    """
+    Name the shard manifest of output_file, e.g. output.manifest.json for output.ndjson.
+    """
+    if output_file.endswith('.zst'):
+        output_file = output_file[:-len('.zst')]
+    return f"{os.path.splitext(output_file)[0]}.manifest.json"
+
+class _ShardWriter:
+    """
+    Writes encoded documents across numbered shard files, each a complete JSON
+    array or NDJSON file. A new shard is started once the current one holds
+    shard_docs documents, or would grow past shard_bytes (uncompressed). Closing
+    the writer lists the shards in a manifest next to them.
+    """
+    
+    def __init__(self, output_file, output_format='json', shard_docs=None, shard_bytes=None):
+        self.output_file = output_file
+        self.output_format = output_format
+        self.shard_docs = shard_docs
+        self.shard_bytes = shard_bytes
+        self.shards = []
+        self.count = 0
+        self.f = None
+        self.writer = None
+        self.bytes = 0
+    
+    def _close_shard(self):
+        if self.writer:
+            self.writer.close()
+            self.f.close()
+            self.shards[-1].update(count=self.writer.count, bytes=self.bytes)
+            self.writer = None
+    
+    def _roll(self):
+        self._close_shard()
+        path = _shard_path(self.output_file, len(self.shards) + 1)
+        self.f = _open_output(path)
+        self.writer = _DocumentWriter(self.f, self.output_format)
+        self.shards.append({"file": os.path.basename(path)})
+        # A JSON shard is framed by its array brackets
+        self.bytes = 2 if self.output_format == 'json' else 0
+    
+    def _size(self, doc_bytes):
+        # Count the newline after each NDJSON document, or the comma before each JSON document but the first
+        if self.output_format == 'ndjson' or self.writer.count:
+            return len(doc_bytes) + 1
+        return len(doc_bytes)
+    
+    def write(self, doc_bytes):
+        shard_full = self.writer is not None and self.writer.count and (
+            (self.shard_docs and self.writer.count >= self.shard_docs) or
+            (self.shard_bytes and self.bytes + self._size(doc_bytes) > self.shard_bytes)
+        )
+        if self.writer is None or shard_full:
+            self._roll()
+        self.bytes += self._size(doc_bytes)
+        self.writer.write(doc_bytes)
+        self.count += 1
+    
+    def close(self):
+        # An empty export still gets one (empty) shard
+        if not self.shards:
+            self._roll()
+        self._close_shard()
+        manifest = {"format": self.output_format, "count": self.count, "shards": self.shards}
+        with open(_manifest_path(self.output_file), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        elif self.f:
+            self.f.close()
+
+@contextlib.contextmanager
+def _open_writer(output_file, output_format='json', shard_docs=None, shard_bytes=None):
+    """
+    Open a document writer for output_file, split into shards when a shard size is given.
+    """
+    if shard_docs or shard_bytes:
+        with _ShardWriter(output_file, output_format, shard_docs, shard_bytes) as writer:
+            yield writer
+    else:
+        with _open_output(output_file) as f:
+            writer = _DocumentWriter(f, output_format)
+            yield writer
+            writer.close()
+
+def _write_pages(writer, pages, on_page, drop_field=None):
+    """
+    Write the documents in pages, calling on_page with the number of documents
+    written after each page. drop_field, if given, is left out of each document.
+    
+    Returns the number of documents written.
+    """
+    count = 0
+    for page in pages:
+        page_count = 0
+        for doc in page:
+            if drop_field:
+                doc.pop(drop_field, None)
+            # Search results are already plain dicts, so serialize them as-is
+            writer.write(_dumps(doc))
+            page_count += 1
+        
+        count += page_count
+        on_page(page_count)
+    return count
+
+def _save_checkpoint(checkpoint_file, checkpoint):
+    """
+    Atomically replace checkpoint_file with the given checkpoint.
+    """
+    temp_file = f"{checkpoint_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(temp_file, checkpoint_file)
+
+def _checkpoint_pages(pages, f, checkpoint_file, key_field, settings, count=0):
+    """
+    Pass pages through, saving a checkpoint once each page has been written to f.
+    
+    The checkpoint records the last key written, the number of documents written
+    and the file offset they end at, which is enough to resume the export later.
+    It also records the export settings, so it isn't resumed with different ones.
+    """
+    for page in pages:
+        # Read the key before the page is written, which may drop it
+        last_key = page[-1][key_field]
+        yield page
+        
+        count += len(page)
+        f.flush()
+        _save_checkpoint(checkpoint_file, dict(
+            settings,
+            last_key=last_key,
+            count=count,
+            offset=f.tell()
+        ))
+
+def _export_key_ranges(client, search_options, key_field, shard_count, output_file, output_format, shard_docs, shard_bytes, on_page, drop_field=None):
+    """
+    Export each key range on its own thread into an NDJSON part file, then merge
+    the parts into output_file, or into shards of it if a shard size is given.
+    
+    Returns the number of documents exported.
+    """
+    filter_expression = search_options.get("filter")
+    range_filters = [f for f in _key_range_filters(key_field, shard_count) if f]
+    part_files = [f"{output_file}.part{i}" for i in range(len(range_filters))]
+    
+    def export_part(range_filter, part_file):
+        if filter_expression:
+            range_filter = f"({filter_expression}) and {range_filter}"
+        pages = _iter_pages(client, dict(search_options, filter=range_filter), key_field)
+        with open(part_file, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            return _write_pages(_DocumentWriter(f, 'ndjson'), pages, on_page, drop_field)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=len(part_files)) as executor:
+            exported_count = sum(executor.map(export_part, range_filters, part_files))
+        
+        with _open_writer(output_file, output_format, shard_docs, shard_bytes) as writer:
+            for part_file in part_files:
+                with open(part_file, 'rb') as f:
+                    for line in f:
+                        writer.write(line.rstrip(b'\n'))
+    finally:
+        for part_file in part_files:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+    
+    return exported_count
 
 def export_search_index_to_json(
     search_service_name,
@@ -14,7 +401,14 @@ def export_search_index_to_json(
     select_fields=None,
     filter_expression=None,
     top=None,
-    show_progress=True
+    show_progress=True,
+    key_field=None,
+    parallel_shards=1,
+    output_format='json',
+    resume=False,
+    include_vectors=False,
+    shard_docs=None,
+    shard_bytes=None
 ):
     """
     Export all documents from an Azure AI Search index to a JSON file.
@@ -28,15 +422,42 @@ def export_search_index_to_json(
     api_key : str
         API key for authenticating to the Azure AI Search service
     output_file : str
-        Path to the output JSON file
+        Path to the output JSON file. Names ending in .zst are compressed with zstd.
     select_fields : list, optional
-        List of fields to include in the output. If None, all fields are included.
+        List of fields to include in the output. If None, all retrievable fields
+        are included except vector fields, unless include_vectors is set. Finding
+        the vector fields needs an admin key; with a query key all retrievable
+        fields are included.
     filter_expression : str, optional
         OData filter expression to filter documents
     top : int, optional
         Maximum number of documents to export. If None, all documents are exported.
     show_progress : bool, optional
         Whether to display a progress bar
+    key_field : str, optional
+        Name of the index's key field. Documents are paged by key instead of by
+        continuation token, which lifts the service's 100,000 document limit.
+        The field must be sortable and filterable. It is only written to the
+        output if select_fields includes it, or isn't given. If None, the key field is read from the index definition, which
+        needs an admin key. Without a key field, exports of more than 100,000
+        documents fail.
+    parallel_shards : int, optional
+        Number of key ranges to export in parallel (default: 1). Requires key_field,
+        and can't be combined with top. Keys are split by their first character.
+    output_format : str, optional
+        'json' to write a JSON array (default), or 'ndjson' to write one document per line
+    resume : bool, optional
+        Continue an interrupted export from its checkpoint file (output_file + '.ckpt').
+        Checkpoints are written after every page when paging by key, unless the
+        export is parallel, compressed or sharded.
+    include_vectors : bool, optional
+        Whether to export vector fields when select_fields isn't given. Vectors are
+        usually most of an index's size, so they are left out by default.
+    shard_docs : int, optional
+        Split the output into shards of at most this many documents
+    shard_bytes : int, optional
+        Split the output into shards of at most this many bytes (before compression).
+        Shards are named like output.part001.json and listed in output.manifest.json.
     
     Returns:
     --------
@@ -44,87 +465,145 @@ def export_search_index_to_json(
         Number of documents exported
     """
     try:
-        # Set up the search client
         endpoint = f"https://{search_service_name}.search.windows.net/"
         credential = AzureKeyCredential(api_key)
-        client = SearchClient(endpoint=endpoint, index_name=index_name, credential=credential)
         
-        # Get document count to estimate progress
-        count_result = client.search("*", include_total_count=True, top=0)
-        total_docs = count_result.get_count()
+        # The index definition gives the key field to page by and the fields exported by default
+        fields = None
+        if not key_field or not (select_fields or include_vectors):
+            fields = _get_index_fields(endpoint, credential, index_name)
+        no_key_reason = None
+        if not key_field:
+            if fields is None:
+                no_key_reason = "looking up the key field needs an admin key, so give the key field or use an admin key"
+            else:
+                key_field, no_key_reason = _find_key_field(fields)
         
-        if top:
-            total_docs = min(total_docs, top)
-            
-        print(f"Found {total_docs} documents in index '{index_name}'")
-        
-        # Initialize progress bar if requested
-        pbar = None
-        if show_progress:
-            try:
-                pbar = tqdm(total=total_docs)
-            except ImportError:
-                print("tqdm library not found. Progress bar will not be displayed.")
+        if parallel_shards > 1 and not key_field:
+            raise ValueError(f"parallel shards require paging by key, but {no_key_reason}")
+        if parallel_shards > 1 and top:
+            raise ValueError("parallel shards can't be combined with top")
         
         # Prepare search options
-        search_options = {
-            "include_total_count": True
-        }
+        search_options = {}
         if select_fields:
             search_options["select"] = select_fields
+        elif not include_vectors:
+            if fields is not None:
+                search_options["select"] = _default_select_fields(fields)
+            else:
+                print("Warning: leaving out vector fields needs an admin key to read the index definition, so all retrievable fields will be exported")
         if filter_expression:
             search_options["filter"] = filter_expression
         
-        # Set page size for efficiency
-        page_size = 1000  # Max page size
-        search_options["top"] = page_size
+        # Paging by key needs the key in every result, but it's only written out if it was selected
+        drop_field = None
+        if key_field and search_options.get("select") and key_field not in search_options["select"]:
+            drop_field = key_field
         
-        # Get all documents (handling pagination)
-        all_docs = []
-        skip = 0
+        # Checkpoint serial exports to a single uncompressed file so they can be resumed
+        sharded = bool(shard_docs or shard_bytes)
+        checkpoint_file = f"{output_file}.ckpt"
+        checkpointing = bool(key_field) and parallel_shards <= 1 and not sharded and not output_file.endswith('.zst')
+        checkpoint = None
+        # A checkpoint can only be resumed with the settings it was written with
+        checkpoint_settings = {
+            "format": output_format,
+            "key_field": key_field,
+            "filter": filter_expression,
+            "select": list(search_options["select"]) if "select" in search_options else None
+        }
+        if resume:
+            if not key_field:
+                raise ValueError(f"resuming requires paging by key, but {no_key_reason}")
+            if not checkpointing:
+                raise ValueError("only uncompressed, unsharded, non-parallel exports with a key field can be resumed")
+            if os.path.exists(checkpoint_file):
+                with open(checkpoint_file, encoding='utf-8') as f:
+                    checkpoint = json.load(f)
+                for name, value in checkpoint_settings.items():
+                    if checkpoint.get(name) != value:
+                        raise ValueError(f"checkpoint was written with {name} {checkpoint.get(name)!r}, not {value!r}")
+                print(f"Resuming export after {checkpoint['count']} documents")
         
-        while True:
-            search_options["skip"] = skip
-            results = client.search("*", **search_options)
-            
-            # Convert results to dictionaries for JSON serialization
-            page_docs = []
-            for doc in results:
-                doc_dict = {k: v for k, v in doc.items()}
-                page_docs.append(doc_dict)
-            
-            if not page_docs:
-                break
-                
-            all_docs.extend(page_docs)
-            skip += len(page_docs)
+        # Set up the search client
+        transport = _create_transport(max(parallel_shards, CONNECTION_POOL_SIZE))
+        client = SearchClient(endpoint=endpoint, index_name=index_name, credential=credential, transport=transport)
+        
+        # The progress bar is only shown on a terminal, and only needs a document count when top isn't given
+        show_progress = show_progress and sys.stderr.isatty()
+        total_docs = top
+        if show_progress and not top:
+            count_result = client.search("*", include_total_count=True, top=0, filter=filter_expression)
+            total_docs = count_result.get_count()
+            print(f"Found {total_docs} documents in index '{index_name}'")
+        
+        # Initialize progress bar
+        pbar = tqdm(
+            total=total_docs,
+            unit='docs',
+            disable=not show_progress,
+            mininterval=0.5,
+            smoothing=0.1
+        )
+        
+        # Stream documents to the JSON file as they arrive (handling pagination)
+        exported_count = checkpoint["count"] if checkpoint else 0
+        pbar.update(exported_count)
+        progress_lock = threading.Lock()
+        
+        def on_page(page_count):
+            nonlocal exported_count
+            with progress_lock:
+                exported_count += page_count
+                pbar.update(page_count)
+        
+        if parallel_shards > 1:
+            _export_key_ranges(
+                client, search_options, key_field, parallel_shards,
+                output_file, output_format, shard_docs, shard_bytes, on_page, drop_field
+            )
+        elif sharded:
+            with _open_writer(output_file, output_format, shard_docs, shard_bytes) as writer:
+                _write_pages(writer, _iter_pages(client, search_options, key_field, top), on_page, drop_field)
+        else:
+            start_key = None
+            if checkpoint:
+                # Drop anything written after the last checkpoint and append from there
+                f = open(output_file, 'r+b', buffering=WRITE_BUFFER_SIZE)
+                f.seek(checkpoint["offset"])
+                f.truncate()
+                start_key = checkpoint["last_key"]
+                if top:
+                    top = max(top - exported_count, 0)
+            else:
+                f = _open_output(output_file)
             
-            # Update progress bar
-            if pbar:
-                pbar.update(len(page_docs))
-            elif show_progress:
-                print(f"Exported {len(all_docs)}/{total_docs} documents...", end="\r")
+            with f:
+                writer = _DocumentWriter(f, output_format, exported_count)
+                pages = _iter_pages(client, search_options, key_field, top, start_key)
+                if checkpointing:
+                    pages = _checkpoint_pages(pages, f, checkpoint_file, key_field, checkpoint_settings, exported_count)
+                _write_pages(writer, pages, on_page, drop_field)
+                writer.close()
             
-            # If we specified a top value and we've reached it
-            if top and len(all_docs) >= top:
-                all_docs = all_docs[:top]
-                break
-                
-            # If we got fewer docs than requested (end of results)
-            if len(page_docs) < page_size:
-                break
-        
-        if pbar:
-            pbar.close()
-        elif show_progress:
-            print()
-        
-        # Write to JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_docs, f, ensure_ascii=False, indent=2)
-        
-        print(f"Successfully exported {len(all_docs)} documents to {output_file}")
-        return len(all_docs)
+            if checkpointing and os.path.exists(checkpoint_file):
+                os.remove(checkpoint_file)
+        
+        pbar.close()
+        
+        # Continuation tokens stop at the skip limit, so more documents than that means some were left out
+        if not key_field and exported_count > MAX_SKIP and (not top or top > exported_count):
+            raise ValueError(
+                f"only the first {exported_count} documents were exported: more than {MAX_SKIP} "
+                f"documents must be paged by key, but {no_key_reason}"
+            )
+        
+        if sharded:
+            print(f"Successfully exported {exported_count} documents to the shards listed in {_manifest_path(output_file)}")
+        else:
+            print(f"Successfully exported {exported_count} documents to {output_file}")
+        return exported_count
         
     except Exception as e:
         print(f"Error exporting documents: {str(e)}")
@@ -134,12 +613,19 @@ def main():
     parser = argparse.ArgumentParser(description='Export Azure AI Search index to JSON file')
     parser.add_argument('--service', required=True, help='Azure Search service name')
     parser.add_argument('--index', required=True, help='Index name')
-    parser.add_argument('--key', required=True, help='API key')
-    parser.add_argument('--output', required=True, help='Output JSON file')
-    parser.add_argument('--select', nargs='+', help='Fields to include (space separated)')
+    parser.add_argument('--key', required=True, help='API key (an admin key is needed to leave out vector fields)')
+    parser.add_argument('--output', required=True, help='Output JSON file (compressed with zstd if the name ends in .zst)')
+    parser.add_argument('--select', nargs='+', help='Fields to include (space separated). Selecting only the fields you need reduces the data transferred.')
     parser.add_argument('--filter', help='OData filter expression')
+    parser.add_argument('--include-vectors', action='store_true', help='Include vector fields when --select is not given (leaving them out needs an admin --key)')
     parser.add_argument('--top', type=int, help='Maximum number of documents to export')
     parser.add_argument('--no-progress', action='store_true', help='Hide progress bar')
+    parser.add_argument('--key-field', help='Key field to page by (default: the index key field, which needs an admin --key to look up). Required for more than 100,000 documents.')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json', help='Output format: a JSON array or one document per line (default: json)')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted export from its checkpoint (requires paging by key)')
+    parser.add_argument('--shard-docs', type=int, help='Split the output into files of at most this many documents')
+    parser.add_argument('--shard-bytes', type=int, help='Split the output into files of at most this many bytes (before compression)')
+    parser.add_argument('--parallel-shards', type=int, default=1, help='Number of key ranges to export in parallel (requires paging by key, default: 1)')
     
     args = parser.parse_args()
     
@@ -151,7 +637,14 @@ def main():
         args.select,
         args.filter,
         args.top,
-        not args.no_progress
+        not args.no_progress,
+        key_field=args.key_field,
+        parallel_shards=args.parallel_shards,
+        output_format=args.format,
+        resume=args.resume,
+        include_vectors=args.include_vectors,
+        shard_docs=args.shard_docs,
+        shard_bytes=args.shard_bytes
     )
 
 if __name__ == "__main__":
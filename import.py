@@ -1,21 +1,182 @@
 from azure.core.credentials import AzureKeyCredential
-from azure.search.documents import SearchClient
-import json
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.search.documents import IndexDocumentsBatch
+from azure.search.documents.aio import SearchClient
+from azure.search.documents.indexes.aio import SearchIndexClient
+import asyncio
+import io
+import itertools
+import mmap
 import os
 import argparse
+import random
 import sys
+import json
+import aiohttp
 from tqdm import tqdm
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
 # filepath: c:\Users\pfekr\source\repos\azure-ai-search-index-export\import.py
 
-def import_json_to_search_index(
+# Files up to this size are parsed in one pass rather than streamed
+MMAP_MAX_BYTES = 256 * 1024 * 1024
+# The service rejects requests over 16 MB, so leave headroom for the request envelope
+MAX_REQUEST_BYTES = 14 * 1024 * 1024
+# Number of leading documents sampled to estimate the average document size
+BATCH_SIZE_SAMPLE = 100
+# Number of connections kept open to the service
+CONNECTION_POOL_SIZE = 32
+# Status codes the service returns when it is throttling or temporarily unavailable
+RETRYABLE_STATUS_CODES = (429, 503)
+# Per-document status codes worth resubmitting: conflicts, concurrent updates and throttling
+RETRYABLE_RESULT_STATUS_CODES = (409, 422, 429, 503)
+MAX_RETRIES = 6
+# Number of failed document keys listed at the end of an import
+MAX_FAILED_KEYS_SHOWN = 100
+
+def _open_input(input_file):
+    """
+    Open input_file for binary reading, decompressing zstd when its name ends in .zst.
+    """
+    if not input_file.endswith('.zst'):
+        return open(input_file, 'rb')
+    if zstd is None:
+        raise ImportError("the zstandard package is required to read .zst files")
+    reader = zstd.ZstdDecompressor().stream_reader(open(input_file, 'rb'), read_across_frames=True)
+    return io.BufferedReader(reader)
+
+def _load_documents(input_file):
+    """
+    Parse a whole JSON array file in one pass. With orjson an uncompressed file is
+    parsed straight from a memory map instead of being read onto the heap first.
+    """
+    with _open_input(input_file) as f:
+        if not orjson:
+            return json.loads(f.read())
+        if input_file.endswith('.zst'):
+            return orjson.loads(f.read())
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files and some file systems can't be mapped
+            return orjson.loads(f.read())
+        with mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def _iter_documents(input_file, input_format='json'):
+    """
+    Yield documents one at a time from a JSON array or NDJSON file.
+    
+    NDJSON files are always read line by line. Compressed JSON files and JSON
+    files larger than MMAP_MAX_BYTES are parsed incrementally with ijson, so they
+    never have to fit in memory. Other files, or any file when ijson isn't
+    installed, are parsed in one pass, which is faster with orjson. Files whose
+    names end in .zst are decompressed with zstd as they are read.
+    """
+    if input_format == 'ndjson':
+        loads = orjson.loads if orjson else json.loads
+        with _open_input(input_file) as f:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+    elif ijson and (not orjson or input_file.endswith('.zst') or os.path.getsize(input_file) > MMAP_MAX_BYTES):
+        with _open_input(input_file) as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    else:
+        yield from _load_documents(input_file)
+
+def _create_transport(pool_size=CONNECTION_POOL_SIZE):
+    """
+    Create an HTTP transport that keeps a pool of connections to the service open,
+    so requests reuse TLS sessions instead of reconnecting.
+    
+    Must be called from a running event loop.
+    """
+    # Same session settings as the SDK's default transport, plus the larger pool
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=pool_size),
+        cookie_jar=aiohttp.DummyCookieJar(),
+        auto_decompress=False
+    )
+    return AioHttpTransport(session=session, connection_timeout=30)
+
+def _pick_batch_size(sample_docs, cap=1000, max_bytes=MAX_REQUEST_BYTES):
+    """
+    Pick the largest batch size, up to cap, whose estimated request size fits within max_bytes.
+    """
+    if orjson:
+        doc_bytes = sum(len(orjson.dumps(doc)) for doc in sample_docs)
+    else:
+        doc_bytes = sum(len(json.dumps(doc).encode('utf-8')) for doc in sample_docs)
+    avg_doc_bytes = doc_bytes / len(sample_docs)
+    return max(1, min(cap, int(max_bytes / avg_doc_bytes)))
+
+def _retry_delay(attempt, response=None):
+    """
+    Seconds to wait before retrying: the service's Retry-After hint if it sent
+    one, otherwise exponential backoff with jitter.
+    """
+    delay = 2 ** attempt + random.random()
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            pass
+    return delay
+
+async def _get_key_field(endpoint, credential, index_name):
+    """
+    Look up the name of the index's key field, which indexing results are reported by.
+    """
+    async with SearchIndexClient(endpoint=endpoint, credential=credential, transport=_create_transport(1)) as index_client:
+        index = await index_client.get_index(index_name)
+    return next(field.name for field in index.fields if field.key)
+
+async def _upload_with_retry(client, batch, merge_documents):
+    """
+    Upload a batch, backing off and retrying while the service is throttling.
+    """
+    index_batch = IndexDocumentsBatch()
+    if merge_documents:
+        index_batch.add_merge_or_upload_actions(batch)
+    else:
+        index_batch.add_upload_actions(batch)
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return await client.index_documents(index_batch)
+        except HttpResponseError as e:
+            if e.status_code not in RETRYABLE_STATUS_CODES or attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, e.response))
+
+async def import_json_to_search_index_async(
     search_service_name,
     index_name,
     api_key,
     input_file,
     batch_size=1000,
     show_progress=True,
-    merge_documents=False
+    merge_documents=False,
+    max_request_bytes=MAX_REQUEST_BYTES,
+    max_concurrency=4,
+    input_format='json'
 ):
     """
     Import documents from a JSON file into an Azure AI Search index.
@@ -29,13 +190,21 @@ def import_json_to_search_index(
     api_key : str
         API key for authenticating to the Azure AI Search service
     input_file : str
-        Path to the input JSON file containing documents
+        Path to the input JSON file containing documents. Names ending in .zst
+        are decompressed with zstd.
     batch_size : int, optional
-        Number of documents to upload in each batch (default: 1000)
+        Maximum number of documents to upload in each batch (default: 1000). The
+        batch size is lowered when needed to keep requests under max_request_bytes.
     show_progress : bool, optional
         Whether to display a progress bar
     merge_documents : bool, optional
         If True, merge documents that already exist; if False, replace them
+    max_request_bytes : int, optional
+        Target maximum size of each upload request in bytes (default: 14 MB)
+    max_concurrency : int, optional
+        Number of batches to upload in parallel (default: 4)
+    input_format : str, optional
+        'json' if the input file is a JSON array (default), or 'ndjson' for one document per line
     
     Returns:
     --------
@@ -43,68 +212,100 @@ def import_json_to_search_index(
         Number of documents successfully imported
     """
     try:
-        # Set up the search client
         endpoint = f"https://{search_service_name}.search.windows.net/"
         credential = AzureKeyCredential(api_key)
-        client = SearchClient(endpoint=endpoint, index_name=index_name, credential=credential)
         
-        # Load documents from JSON file
-        print(f"Loading documents from {input_file}...")
-        with open(input_file, 'r', encoding='utf-8') as f:
-            documents = json.load(f)
+        # Stream documents from JSON file
+        print(f"Importing documents from {input_file} into index '{index_name}'...")
+        documents = _iter_documents(input_file, input_format)
         
-        if not documents:
-            print("No documents found in the input file.")
-            return 0
-            
-        total_docs = len(documents)
-        print(f"Found {total_docs} documents to import into index '{index_name}'")
+        # Size batches from the first few documents so requests stay under the service limit
+        sample_docs = list(itertools.islice(documents, BATCH_SIZE_SAMPLE))
+        if sample_docs:
+            batch_size = _pick_batch_size(sample_docs, cap=batch_size, max_bytes=max_request_bytes)
+            print(f"Using batch size of {batch_size} documents")
+        documents = itertools.chain(sample_docs, documents)
         
-        # Initialize progress bar if requested
-        pbar = None
-        if show_progress:
-            try:
-                pbar = tqdm(total=total_docs)
-            except ImportError:
-                print("tqdm library not found. Progress bar will not be displayed.")
+        # Initialize progress bar, hidden when requested or when output isn't a terminal
+        pbar = tqdm(
+            total=None,
+            unit='docs',
+            disable=not show_progress or not sys.stderr.isatty(),
+            mininterval=0.5,
+            smoothing=0.1
+        )
         
         # Upload documents in batches
+        queued_count = 0
         uploaded_count = 0
-        failed_count = 0
+        failed_keys = []
+        
+        def next_batch():
+            return list(itertools.islice(documents, batch_size))
         
-        # Process in batches
-        for i in range(0, total_docs, batch_size):
-            batch = documents[i:i + batch_size]
+        transport = _create_transport(max(max_concurrency, CONNECTION_POOL_SIZE))
+        async with SearchClient(endpoint=endpoint, index_name=index_name, credential=credential, transport=transport) as client:
+            # Results are reported by key, so it's needed to match them back to documents
+            key_field = await _get_key_field(endpoint, credential, index_name)
             
-            try:
-                upload_mode = 'mergeOrUpload' if merge_documents else 'upload'
-                results = client.upload_documents(documents=batch, indexing_action=upload_mode)
-                
-                # Count successes and failures
-                success_count = sum(1 for r in results if r.succeeded)
-                fail_count = len(results) - success_count
-                
-                uploaded_count += success_count
-                failed_count += fail_count
-                
-                # Update progress
-                if pbar:
-                    pbar.update(len(batch))
-                elif show_progress:
-                    print(f"Uploaded {uploaded_count}/{total_docs} documents...", end="\r")
+            # Bounds the batches in flight, which also keeps the reader from running ahead of the uploads
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def upload_batch(batch, batch_start):
+                nonlocal uploaded_count
+                pending = batch
+                try:
+                    for attempt in range(MAX_RETRIES + 1):
+                        results = await _upload_with_retry(client, pending, merge_documents)
+                        
+                        # Count successes, and resubmit documents that failed for a transient reason
+                        retry_keys = set()
+                        for result in results:
+                            if result.succeeded:
+                                uploaded_count += 1
+                            elif result.status_code in RETRYABLE_RESULT_STATUS_CODES and attempt < MAX_RETRIES:
+                                retry_keys.add(result.key)
+                            else:
+                                failed_keys.append(result.key)
+                        
+                        pbar.update(len(pending) - len(retry_keys))
+                        if not retry_keys:
+                            break
+                        pending = [doc for doc in pending if str(doc.get(key_field)) in retry_keys]
+                        await asyncio.sleep(_retry_delay(attempt))
                     
-            except Exception as batch_error:
-                print(f"\nError uploading batch starting at document {i}: {str(batch_error)}")
-                failed_count += len(batch)
+                except Exception as batch_error:
+                    print(f"\nError uploading batch starting at document {batch_start}: {str(batch_error)}")
+                    failed_keys.extend(str(doc.get(key_field)) for doc in pending)
+                finally:
+                    semaphore.release()
+            
+            # Process in batches, parsing on a worker thread so uploads keep running meanwhile
+            tasks = set()
+            while True:
+                batch = await asyncio.to_thread(next_batch)
+                if not batch:
+                    break
+                
+                await semaphore.acquire()
+                task = asyncio.create_task(upload_batch(batch, queued_count))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                queued_count += len(batch)
+            
+            await asyncio.gather(*tasks)
         
-        if pbar:
-            pbar.close()
-        elif show_progress:
-            print()
+        pbar.close()
+        
+        if queued_count == 0:
+            print("No documents found in the input file.")
+            return 0
         
         print(f"Import complete. Successfully imported {uploaded_count} documents.")
-        if failed_count > 0:
-            print(f"Failed to import {failed_count} documents.")
+        if failed_keys:
+            print(f"Failed to import {len(failed_keys)} documents with keys: {', '.join(failed_keys[:MAX_FAILED_KEYS_SHOWN])}")
+            if len(failed_keys) > MAX_FAILED_KEYS_SHOWN:
+                print(f"... and {len(failed_keys) - MAX_FAILED_KEYS_SHOWN} more.")
             
         return uploaded_count
         
@@ -112,14 +313,47 @@ def import_json_to_search_index(
         print(f"Error importing documents: {str(e)}")
         return 0
 
+def import_json_to_search_index(
+    search_service_name,
+    index_name,
+    api_key,
+    input_file,
+    batch_size=1000,
+    show_progress=True,
+    merge_documents=False,
+    max_request_bytes=MAX_REQUEST_BYTES,
+    max_concurrency=4,
+    input_format='json'
+):
+    """
+    Import documents from a JSON file into an Azure AI Search index.
+    
+    Runs import_json_to_search_index_async to completion; see it for parameters.
+    """
+    return asyncio.run(import_json_to_search_index_async(
+        search_service_name,
+        index_name,
+        api_key,
+        input_file,
+        batch_size,
+        show_progress,
+        merge_documents,
+        max_request_bytes,
+        max_concurrency,
+        input_format
+    ))
+
 def main():
     parser = argparse.ArgumentParser(description='Import documents from JSON file to Azure AI Search index')
     parser.add_argument('--service', required=True, help='Azure Search service name')
     parser.add_argument('--index', required=True, help='Index name')
     parser.add_argument('--key', required=True, help='API key')
-    parser.add_argument('--input', required=True, help='Input JSON file')
-    parser.add_argument('--batch-size', type=int, default=1000, help='Batch size for uploads (default: 1000)')
+    parser.add_argument('--input', required=True, help='Input JSON file (decompressed with zstd if the name ends in .zst)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Maximum batch size for uploads (default: 1000)')
+    parser.add_argument('--max-request-bytes', type=int, default=MAX_REQUEST_BYTES, help='Target maximum upload request size in bytes (default: 14 MB)')
     parser.add_argument('--merge', action='store_true', help='Merge with existing documents instead of replacing')
+    parser.add_argument('--format', choices=['json', 'ndjson'], default='json', help='Input format: a JSON array or one document per line (default: json)')
+    parser.add_argument('--max-concurrency', type=int, default=4, help='Number of batches to upload in parallel (default: 4)')
     parser.add_argument('--no-progress', action='store_true', help='Hide progress bar')
     
     args = parser.parse_args()
@@ -131,7 +365,10 @@ def main():
         args.input,
         args.batch_size,
         not args.no_progress,
-        args.merge
+        args.merge,
+        args.max_request_bytes,
+        args.max_concurrency,
+        args.format
     )
 
 if __name__ == "__main__":